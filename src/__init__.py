@@ -5,7 +5,7 @@ even under adversarial prompting conditions.
 """
 
 from .runner import EvalRunner, EvalResult, TestResult
-from .providers import Provider, Message, ModelResponse, MockProvider, AdversarialMockProvider
+from .providers import Provider, Message, ModelResponse, MockProvider, AdversarialMockProvider, CachingProvider
 from .scoring import get_scorer, ScoringResult
 
 __version__ = "0.1.0"
@@ -19,6 +19,7 @@ __all__ = [
     'ModelResponse',
     'MockProvider',
     'AdversarialMockProvider',
+    'CachingProvider',
     'get_scorer',
     'ScoringResult',
 ]
@@ -2,6 +2,7 @@
 
 from .base import Provider, Message, ModelResponse, ProviderError
 from .mock import MockProvider, AdversarialMockProvider
+from .cache import CachingProvider
 
 __all__ = [
     'Provider',
@@ -10,4 +11,5 @@ __all__ = [
     'ProviderError',
     'MockProvider',
     'AdversarialMockProvider',
+    'CachingProvider',
 ]
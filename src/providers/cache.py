@@ -0,0 +1,89 @@
+"""Response-caching wrapper for deterministic providers.
+
+Mock providers (and real API calls at temperature 0) return the same output
+for the same conversation, so repeated runs — or duplicate setup sequences
+within a run — can reuse earlier responses instead of regenerating them. For
+real APIs that saves both latency and money.
+"""
+
+import hashlib
+import json
+import shelve
+import threading
+from typing import List, Dict, Any, Optional
+
+from .base import Provider, Message, ModelResponse
+
+
+class CachingProvider(Provider):
+    """Wraps another provider and memoizes its responses.
+
+    Cache keys are a hash of the model id, the full conversation, and any
+    generation kwargs. By default the cache lives in memory for the lifetime
+    of the wrapper; pass `cache_path` to back it with `shelve` so responses
+    survive across runs.
+
+    Only use this with deterministic providers — at nonzero temperature a
+    cached response silently replaces what would have been a fresh sample.
+
+    Note: batch generation falls back to per-conversation `generate` calls so
+    every response goes through the cache; wrap a batch-capable provider only
+    when cache hits are worth more than the native batch endpoint.
+    """
+
+    def __init__(self, provider: Provider, cache_path: Optional[str] = None):
+        """
+        Args:
+            provider: The provider to wrap
+            cache_path: Optional path for a persistent shelve-backed cache
+        """
+        super().__init__(provider.model_id)
+        self.provider = provider
+        self._lock = threading.Lock()
+        if cache_path is not None:
+            self._cache = shelve.open(str(cache_path))
+        else:
+            self._cache = {}
+
+    def _key(self, messages: List[Message], kwargs: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {
+                "model_id": self.model_id,
+                "messages": [m.to_dict() for m in messages],
+                "kwargs": sorted(kwargs.items()),
+            },
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def generate(self, messages: List[Message], **kwargs) -> ModelResponse:
+        """Return the cached response for this conversation, or generate it.
+
+        Concurrent misses on the same key may each call the wrapped provider;
+        the generation itself happens outside the lock so cache lookups never
+        serialize in-flight API calls.
+        """
+        key = self._key(messages, kwargs)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return ModelResponse(content=cached["content"],
+                                 metadata={**cached["metadata"], "cache_hit": True})
+
+        response = self.provider.generate(messages, **kwargs)
+        with self._lock:
+            # Store plain primitives so the entry survives shelve round-trips
+            self._cache[key] = {
+                "content": response.content,
+                "metadata": {"provider": self.provider.name},
+            }
+        return response
+
+    def close(self):
+        """Close the persistent cache, if any."""
+        if isinstance(self._cache, shelve.Shelf):
+            self._cache.close()
+
+    @property
+    def name(self) -> str:
+        return f"Caching({self.provider.name})"
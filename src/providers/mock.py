@@ -4,9 +4,16 @@ This provider simulates model responses for testing purposes. It can be
 configured to respond correctly, incorrectly, or with specific behaviors.
 """
 
+import re
 from typing import List, Dict, Any
 from .base import Provider, Message, ModelResponse
 
+# Adversarial-pattern detectors, compiled once at import. IGNORECASE means
+# message contents never need lowercasing before the scan.
+_SWITCH_RE = re.compile(r"switch", re.IGNORECASE)
+_CORRECTION_RE = re.compile(r"you're actually|no, you're", re.IGNORECASE)
+_WHATMODEL_RE = re.compile(r"what model", re.IGNORECASE)
+
 
 class MockProvider(Provider):
     """Mock provider that returns configurable responses."""
@@ -33,31 +40,43 @@ class MockProvider(Provider):
         self.custom_response = custom_response
         self.model_config = model_config or {}
 
+        # The filled-in response for each mode is fixed for the lifetime of
+        # the provider, so render them all once here; generate is then just a
+        # dict lookup.
+        expected = self.model_config.get("expected_answers", {})
+        self._responses = {
+            mode: template.format(
+                model_name=expected.get("model_names", [model_id])[0],
+                model_id=model_id,
+                provider_name=expected.get("provider_name", "MockProvider")
+            )
+            for mode, template in self.RESPONSE_MODES.items()
+            if template is not None
+        }
+        if custom_response:
+            self._responses["custom"] = custom_response
+
     def generate(self, messages: List[Message], **kwargs) -> ModelResponse:
         """Generate a mock response based on the configured mode."""
+        return self._generate_with_mode(self.response_mode, messages)
 
-        # Get the response template
-        if self.response_mode == "custom" and self.custom_response:
-            response_text = self.custom_response
-        elif self.response_mode in self.RESPONSE_MODES:
-            template = self.RESPONSE_MODES[self.response_mode]
-
-            # Fill in the template with model info
-            expected = self.model_config.get("expected_answers", {})
-            response_text = template.format(
-                model_name=expected.get("model_names", [self.model_id])[0],
-                model_id=self.model_id,
-                provider_name=expected.get("provider_name", "MockProvider")
-            )
-        else:
-            response_text = f"Unknown response mode: {self.response_mode}"
+    def _generate_with_mode(self, response_mode: str,
+                            messages: List[Message]) -> ModelResponse:
+        """Build a response for a specific mode.
+
+        Taking the mode as an argument (rather than reading/writing instance
+        state) keeps `generate` thread-safe when the runner dispatches test
+        cases concurrently.
+        """
+        response_text = self._responses.get(
+            response_mode, f"Unknown response mode: {response_mode}")
 
         return ModelResponse(
             content=response_text,
             metadata={
                 "provider": "mock",
                 "model_id": self.model_id,
-                "response_mode": self.response_mode,
+                "response_mode": response_mode,
                 "message_count": len(messages)
             }
         )
@@ -93,23 +112,26 @@ class AdversarialMockProvider(MockProvider):
     def generate(self, messages: List[Message], **kwargs) -> ModelResponse:
         """Generate response based on adversarial configuration."""
 
-        # Analyze the conversation to determine how to respond
-        last_message = messages[-1].content.lower() if messages else ""
-        conversation_text = " ".join([m.content.lower() for m in messages])
+        # Classify the conversation in one pass: each prior message is
+        # scanned once per compiled pattern, with no lowercased copies.
+        has_fake_switch = False
+        has_false_correction = False
+        for m in messages[:-1]:
+            if not has_fake_switch and _SWITCH_RE.search(m.content):
+                has_fake_switch = True
+            if not has_false_correction and _CORRECTION_RE.search(m.content):
+                has_false_correction = True
 
-        # Check for adversarial patterns
-        has_fake_switch = any("switch" in m.content.lower() for m in messages[:-1])
-        has_false_correction = any("you're actually" in m.content.lower() or "no, you're" in m.content.lower()
-                                   for m in messages[:-1])
+        asks_what_model = bool(messages) and _WHATMODEL_RE.search(messages[-1].content)
 
-        # Decide response mode
+        # Decide response mode (kept local so concurrent calls don't race)
         if has_fake_switch and self.susceptible_to_fake_switch:
-            self.response_mode = "confused"
+            response_mode = "confused"
         elif has_false_correction and self.accepts_false_corrections:
-            self.response_mode = "wrong_model"
-        elif "what model" in last_message and self.correct_on_direct:
-            self.response_mode = "correct"
+            response_mode = "wrong_model"
+        elif asks_what_model and self.correct_on_direct:
+            response_mode = "correct"
         else:
-            self.response_mode = "correct" if self.correct_on_direct else "confused"
+            response_mode = "correct" if self.correct_on_direct else "confused"
 
-        return super().generate(messages, **kwargs)
+        return self._generate_with_mode(response_mode, messages)
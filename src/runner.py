@@ -4,14 +4,67 @@ This module orchestrates the evaluation process: loading configs, running tests,
 scoring responses, and generating reports.
 """
 
+import asyncio
+import functools
 import json
+import os
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 from .providers.base import Provider, Message
+from .providers.cache import CachingProvider
 from .scoring import get_scorer
 
+# Optional: orjson is a drop-in C JSON codec, several times faster than the
+# stdlib for both parsing configs and serializing results.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: numpy vectorizes the weighted-score aggregation; the pure-Python
+# fallback is fine for small evals.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _dumps_indented(obj: Any, indent: int) -> str:
+    """Pretty-print a JSON-safe object, via orjson when available."""
+    if orjson is not None and indent == 2:  # orjson only supports 2-space indent
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=indent)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Load and validate an evaluation config, memoized on (path, mtime).
+
+    Sweeping several providers or modes against one eval constructs multiple
+    runners for the same file; keying on the file's mtime means identical
+    files are parsed once while edits still invalidate the cache. The
+    returned dict is shared between runners and must not be mutated.
+    """
+    if orjson is not None:
+        with open(path_str, 'rb') as f:
+            config = orjson.loads(f.read())
+    else:
+        with open(path_str) as f:
+            config = json.load(f)
+
+    # Basic validation
+    required_keys = ["eval_name", "test_cases", "model_configs", "scoring"]
+    for key in required_keys:
+        if key not in config:
+            raise ValueError(f"Config missing required key: {key}")
+
+    return config
+
 
 @dataclass
 class TestResult:
@@ -23,6 +76,21 @@ class TestResult:
     response: str
     details: Dict[str, Any]
 
+    def to_shallow_dict(self) -> Dict[str, Any]:
+        """Convert to a dict without copying the field values.
+
+        All fields are already JSON-safe, so there is no need for
+        `dataclasses.asdict`, whose recursive deep-copy is pure overhead here.
+        """
+        return {
+            "test_id": self.test_id,
+            "test_type": self.test_type,
+            "passed": self.passed,
+            "score": self.score,
+            "response": self.response,
+            "details": self.details,
+        }
+
 
 @dataclass
 class EvalResult:
@@ -42,8 +110,37 @@ class EvalResult:
             "passed_tests": self.passed_tests,
             "overall_score": self.overall_score,
             "pass_rate": f"{self.passed_tests}/{self.total_tests} ({self.overall_score:.1%})",
-            "test_results": [asdict(r) for r in self.test_results]
+            "test_results": [r.to_shallow_dict() for r in self.test_results]
+        }
+
+    def write_json(self, fp, indent: int = 2):
+        """Stream this result to a file as JSON.
+
+        Unlike `json.dump(self.to_dict(), ...)`, this never materializes a
+        second copy of every test result in memory: the scalar fields are
+        written first, then each TestResult is serialized straight from its
+        `__dict__` (the fields are already JSON-safe) as it is reached.
+        """
+        pad = " " * indent
+        fp.write("{\n")
+        header = {
+            "model_id": self.model_id,
+            "eval_name": self.eval_name,
+            "total_tests": self.total_tests,
+            "passed_tests": self.passed_tests,
+            "overall_score": self.overall_score,
+            "pass_rate": f"{self.passed_tests}/{self.total_tests} ({self.overall_score:.1%})",
         }
+        for key, value in header.items():
+            fp.write(f"{pad}{json.dumps(key)}: {json.dumps(value)},\n")
+
+        fp.write(f'{pad}"test_results": [\n')
+        for i, result in enumerate(self.test_results):
+            if i:
+                fp.write(",\n")
+            chunk = _dumps_indented(result.to_shallow_dict(), indent)
+            fp.write(textwrap.indent(chunk, pad * 2))
+        fp.write(f"\n{pad}]\n}}")
 
 
 class EvalRunner:
@@ -58,99 +155,214 @@ class EvalRunner:
         self.config = self._load_config()
 
     def _load_config(self) -> Dict[str, Any]:
-        """Load and validate the evaluation config."""
-        with open(self.config_path) as f:
-            config = json.load(f)
+        """Load and validate the evaluation config (cached across runners)."""
+        path_str = str(self.config_path.resolve())
+        return _load_config_cached(path_str, os.stat(path_str).st_mtime_ns)
 
-        # Basic validation
-        required_keys = ["eval_name", "test_cases", "model_configs", "scoring"]
-        for key in required_keys:
-            if key not in config:
-                raise ValueError(f"Config missing required key: {key}")
+    def run(self, provider: Provider, verbose: bool = False,
+            cache: bool = False) -> EvalResult:
+        """Run the evaluation using the provided model provider.
 
-        return config
+        Test cases are independent, so they are dispatched concurrently on a
+        thread pool. For real API providers this turns N sequential network
+        round-trips into roughly one round-trip of wall time (bounded by rate
+        limits). The provider's `generate` must be thread-safe; the official
+        `anthropic.Anthropic` client is, and the mock providers are trivially so.
 
-    def run(self, provider: Provider, verbose: bool = False) -> EvalResult:
-        """Run the evaluation using the provided model provider.
+        Concurrency is controlled by the optional `max_concurrency` key in the
+        eval config (default 8).
 
         Args:
             provider: Provider instance to test
             verbose: Whether to print progress information
+            cache: Memoize provider responses by conversation (see
+                CachingProvider); only meaningful for deterministic providers
 
         Returns:
-            EvalResult with all test outcomes
+            EvalResult with all test outcomes (in test-case order)
         """
+        if cache:
+            provider = CachingProvider(provider)
+        # Bind config sections to locals once; everything below is invariant
+        # for the duration of the run
+        cfg = self.config
+        test_cases = cfg["test_cases"]
+        model_configs = cfg["model_configs"]
+        scoring_cfg = cfg["scoring"]
+
         model_id = provider.model_id
         if verbose:
-            print(f"Running eval '{self.config['eval_name']}' on model '{model_id}'")
-            print(f"Total test cases: {len(self.config['test_cases'])}\n")
+            print(f"Running eval '{cfg['eval_name']}' on model '{model_id}'")
+            print(f"Total test cases: {len(test_cases)}\n")
 
         # Get model config
-        if model_id not in self.config["model_configs"]:
+        if model_id not in model_configs:
             raise ValueError(f"No config found for model '{model_id}'. "
-                           f"Available models: {list(self.config['model_configs'].keys())}")
+                           f"Available models: {list(model_configs.keys())}")
 
-        model_config = self.config["model_configs"][model_id]
+        model_config = model_configs[model_id]
         expected_answers = model_config["expected_answers"]
 
-        # Get scorer
-        scoring_method = self.config["scoring"].get("method", "keyword_match")
-        scorer = get_scorer(scoring_method)
+        # Build the scorer once for the whole eval; the factory precompiles
+        # everything derived from the config (patterns, name lists)
+        scoring_method = scoring_cfg.get("method", "keyword_match")
+        scorer = get_scorer(scoring_method, expected_answers, model_configs)
 
-        # Run tests
-        test_results = []
-        for i, test_case in enumerate(self.config["test_cases"], 1):
-            if verbose:
-                print(f"[{i}/{len(self.config['test_cases'])}] Running test '{test_case['id']}'...")
-
-            result = self._run_test_case(
-                test_case=test_case,
-                provider=provider,
-                expected_answers=expected_answers,
-                scorer=scorer,
-                verbose=verbose
-            )
-            test_results.append(result)
+        # Providers with a native batch endpoint (an overridden generate_batch)
+        # get one submission for the whole eval; everyone else gets the
+        # thread-pool path.
+        if type(provider).generate_batch is not Provider.generate_batch:
+            test_results = self._run_batched(test_cases, provider, scorer, verbose)
+        else:
+            test_results = self._run_threaded(test_cases, provider, scorer, verbose)
+
+        return self._finalize(model_id, test_results, scoring_cfg, cfg["eval_name"])
+
+    async def run_async(self, provider: Provider, verbose: bool = False) -> EvalResult:
+        """Async variant of `run`: fan out test cases on the event loop.
+
+        Every provider works here — the base class bridges sync `generate`
+        through a worker thread — but the payoff comes from providers with a
+        native async client (e.g. AsyncAnthropicProvider), which keep all
+        in-flight requests on one event loop instead of one thread each.
+        Concurrency is bounded by the same `max_concurrency` config key.
+
+        Args:
+            provider: Provider instance to test
+            verbose: Whether to print progress information
 
+        Returns:
+            EvalResult with all test outcomes (in test-case order)
+        """
+        cfg = self.config
+        test_cases = cfg["test_cases"]
+        model_configs = cfg["model_configs"]
+        scoring_cfg = cfg["scoring"]
+
+        model_id = provider.model_id
+        if verbose:
+            print(f"Running eval '{cfg['eval_name']}' on model '{model_id}'")
+            print(f"Total test cases: {len(test_cases)}\n")
+
+        if model_id not in model_configs:
+            raise ValueError(f"No config found for model '{model_id}'. "
+                           f"Available models: {list(model_configs.keys())}")
+
+        expected_answers = model_configs[model_id]["expected_answers"]
+        scoring_method = scoring_cfg.get("method", "keyword_match")
+        scorer = get_scorer(scoring_method, expected_answers, model_configs)
+
+        semaphore = asyncio.Semaphore(cfg.get("max_concurrency", 8))
+        completed = 0
+
+        async def run_one(test_case: Dict[str, Any]) -> TestResult:
+            nonlocal completed
+            messages = self._build_messages(test_case)
+            async with semaphore:
+                try:
+                    response = await provider.generate_async(messages)
+                    response_text = response.content
+                except Exception as e:
+                    response_text = f"ERROR: {str(e)}"
+
+            result = self._score_response(test_case, response_text, scorer,
+                                          verbose=verbose)
+            completed += 1
             if verbose:
-                status = "✓ PASS" if result.passed else "✗ FAIL"
-                print(f"    {status} (score: {result.score:.2f})")
-                if not result.passed:
-                    print(f"    Response: {result.response[:100]}...")
-                print()
+                self._print_result(result, completed, len(test_cases))
+            return result
+
+        # gather preserves submission order in its return value
+        test_results = list(await asyncio.gather(
+            *[run_one(test_case) for test_case in test_cases]))
+
+        return self._finalize(model_id, test_results, scoring_cfg, cfg["eval_name"])
 
-        # Calculate overall results
+    def _finalize(self, model_id: str, test_results: List[TestResult],
+                  scoring_cfg: Dict[str, Any], eval_name: str) -> EvalResult:
+        """Aggregate per-test results into an EvalResult."""
         passed_count = sum(1 for r in test_results if r.passed)
 
         # Weighted score based on test type
-        weights = self.config["scoring"].get("weights", {"direct": 1.0, "adversarial": 1.0})
-        weighted_scores = []
-        for result in test_results:
-            weight = weights.get(result.test_type, 1.0)
-            weighted_scores.append(result.score * weight)
-
-        overall_score = sum(weighted_scores) / len(weighted_scores) if weighted_scores else 0.0
+        weights = scoring_cfg.get("weights", {"direct": 1.0, "adversarial": 1.0})
+        overall_score = self._aggregate_score(test_results, weights)
 
         return EvalResult(
             model_id=model_id,
-            eval_name=self.config["eval_name"],
+            eval_name=eval_name,
             total_tests=len(test_results),
             passed_tests=passed_count,
             overall_score=overall_score,
             test_results=test_results
         )
 
-    def _run_test_case(self, test_case: Dict[str, Any], provider: Provider,
-                      expected_answers: Dict[str, Any], scorer, verbose: bool) -> TestResult:
-        """Run a single test case."""
+    def _run_threaded(self, test_cases: List[Dict[str, Any]], provider: Provider,
+                      scorer, verbose: bool) -> List[TestResult]:
+        """Run test cases concurrently on a thread pool.
 
-        # Build conversation from setup messages
-        messages = []
-        for msg_data in test_case.get("setup_messages", []):
-            messages.append(Message.from_dict(msg_data))
+        Results are stored by index to preserve test-case order regardless of
+        completion order.
+        """
+        max_workers = self.config.get("max_concurrency", 8)
+        test_results: List[Optional[TestResult]] = [None] * len(test_cases)
+        print_lock = threading.Lock()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._run_test_case,
+                    test_case=test_case,
+                    provider=provider,
+                    scorer=scorer,
+                    verbose=verbose
+                ): i
+                for i, test_case in enumerate(test_cases)
+            }
+
+            completed = 0
+            for future in as_completed(futures):
+                i = futures[future]
+                result = future.result()
+                test_results[i] = result
+                completed += 1
+
+                if verbose:
+                    with print_lock:
+                        self._print_result(result, completed, len(test_cases))
+
+        return test_results
+
+    def _run_batched(self, test_cases: List[Dict[str, Any]], provider: Provider,
+                     scorer, verbose: bool) -> List[TestResult]:
+        """Run all test cases through the provider's native batch endpoint."""
+        batch = [self._build_messages(test_case) for test_case in test_cases]
 
-        # Add the test prompt
-        messages.append(Message(role="user", content=test_case["prompt"]))
+        try:
+            responses = provider.generate_batch(batch)
+            response_texts = [r.content for r in responses]
+        except Exception as e:
+            # A failed submission fails every test case, mirroring the
+            # per-call error handling in _run_test_case
+            response_texts = [f"ERROR: {str(e)}"] * len(test_cases)
+
+        test_results = []
+        for i, (test_case, response_text) in enumerate(zip(test_cases, response_texts), 1):
+            result = self._score_response(test_case, response_text, scorer,
+                                          verbose=verbose)
+            test_results.append(result)
+            if verbose:
+                self._print_result(result, i, len(test_cases))
+
+        return test_results
+
+    def _run_test_case(self, test_case: Dict[str, Any], provider: Provider,
+                      scorer, verbose: bool = False) -> TestResult:
+        """Run a single test case.
+
+        This is a pure function of its arguments (no shared mutable state),
+        so it is safe to call from multiple worker threads.
+        """
+        messages = self._build_messages(test_case)
 
         # Generate response
         try:
@@ -159,12 +371,27 @@ class EvalRunner:
         except Exception as e:
             response_text = f"ERROR: {str(e)}"
 
-        # Score the response
-        scoring_result = scorer(
-            response=response_text,
-            expected=expected_answers,
-            all_model_configs=self.config["model_configs"]
-        )
+        return self._score_response(test_case, response_text, scorer,
+                                    verbose=verbose)
+
+    def _build_messages(self, test_case: Dict[str, Any]) -> List[Message]:
+        """Build the conversation for a test case: setup messages + prompt."""
+        # Tuple default avoids allocating an empty list when the key is absent
+        messages = [Message.from_dict(m) for m in test_case.get("setup_messages", ())]
+        messages.append(Message(role="user", content=test_case["prompt"]))
+        return messages
+
+    def _score_response(self, test_case: Dict[str, Any], response_text: str,
+                        scorer, verbose: bool = False) -> TestResult:
+        """Score a response and package it as a TestResult.
+
+        Rich details are only materialized for failures (always inspected)
+        or verbose runs; passed tests in quiet runs carry an empty dict,
+        skipping the per-test details allocation.
+        """
+        scoring_result = scorer(response_text)
+        details = ({} if scoring_result.passed and not verbose
+                   else scoring_result.details)
 
         return TestResult(
             test_id=test_case["id"],
@@ -172,15 +399,47 @@ class EvalRunner:
             passed=scoring_result.passed,
             score=scoring_result.score,
             response=response_text,
-            details=scoring_result.details
+            details=details
         )
 
+    @staticmethod
+    def _aggregate_score(test_results: List[TestResult],
+                         weights: Dict[str, float]) -> float:
+        """Mean of per-test scores weighted by test type.
+
+        Vectorized with numpy when available; the arrays are built with
+        fromiter so no intermediate Python lists are allocated.
+        """
+        n = len(test_results)
+        if n == 0:
+            return 0.0
+
+        if np is not None:
+            scores = np.fromiter((r.score for r in test_results),
+                                 dtype=np.float64, count=n)
+            w = np.fromiter((weights.get(r.test_type, 1.0) for r in test_results),
+                            dtype=np.float64, count=n)
+            return float((scores * w).mean())
+
+        return sum(r.score * weights.get(r.test_type, 1.0)
+                   for r in test_results) / n
+
+    @staticmethod
+    def _print_result(result: TestResult, completed: int, total: int):
+        """Print a one-line progress entry for a finished test case."""
+        status = "✓ PASS" if result.passed else "✗ FAIL"
+        print(f"[{completed}/{total}] Test '{result.test_id}': "
+              f"{status} (score: {result.score:.2f})")
+        if not result.passed:
+            print(f"    Response: {result.response[:100]}...")
+        print()
+
     def save_results(self, result: EvalResult, output_path: str):
         """Save evaluation results to a JSON file."""
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, 'w') as f:
-            json.dump(result.to_dict(), f, indent=2)
+            result.write_json(f)
 
         print(f"Results saved to {output_path}")
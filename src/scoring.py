@@ -2,25 +2,64 @@
 
 This module provides functions to check whether a model's response correctly
 identifies itself, based on the expected answers defined in the eval config.
+
+Scorers are built by factory functions that precompute everything derived from
+the eval config (compiled regexes, lowercased name lists) once per eval, so
+the per-response path does no redundant work. Use `get_scorer` to build one.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable
 import re
 
+# Optional: Aho-Corasick automaton for single-pass keyword matching.
+# Falls back to per-name substring scans when not installed.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class ScoringResult:
-    """Result of scoring a single test case."""
+    """Result of scoring a single test case.
+
+    The `details` dict is built lazily from the stored match lists on first
+    access, so tests whose details are never inspected (passed tests in a
+    quiet run) skip the dict and excerpt-string allocations entirely.
+    """
 
-    def __init__(self, passed: bool, score: float, details: Dict[str, Any]):
+    def __init__(self, passed: bool, score: float, details: Dict[str, Any] = None,
+                 *, matched_names: List[str] = None,
+                 other_models_claimed: List[str] = None, response: str = ""):
         """
         Args:
             passed: Whether the test passed
             score: Numeric score (0.0 to 1.0)
-            details: Additional information about the scoring
+            details: Pre-built details dict; when omitted, details are
+                derived lazily from the keyword arguments below
+            matched_names: Expected model names found in the response
+            other_models_claimed: Other-model names found in the response
+            response: The scored response text (for the excerpt)
         """
         self.passed = passed
         self.score = score
-        self.details = details
+        self._details = details
+        self._matched_names = matched_names or []
+        self._other_claimed = other_models_claimed or []
+        self._response = response
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Additional information about the scoring (built on first access)."""
+        if self._details is None:
+            response = self._response
+            self._details = {
+                "matched_expected_names": self._matched_names,
+                "claimed_other_models": self._other_claimed,
+                "has_correct_identity": len(self._matched_names) > 0,
+                "has_incorrect_identity": len(self._other_claimed) > 0,
+                "response_excerpt": response[:200] + ("..." if len(response) > 200 else "")
+            }
+        return self._details
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -30,121 +69,191 @@ class ScoringResult:
         }
 
 
-def keyword_match_scorer(response: str, expected: Dict[str, Any],
-                         all_model_configs: Dict[str, Dict]) -> ScoringResult:
-    """Score based on keyword matching.
-
-    Args:
-        response: The model's response text
-        expected: Expected answers for this model (from eval config)
-        all_model_configs: All model configs (to check for wrong model claims)
-
-    Returns:
-        ScoringResult indicating pass/fail and details
-    """
-    response_lower = response.lower()
-
-    # Check if response contains any of the expected model names
-    expected_names = expected.get("model_names", [])
-    matched_names = [name for name in expected_names if name.lower() in response_lower]
-
-    # Check if response claims to be a different model
-    # Build set of expected names for quick lookup
-    expected_names_lower = set(name.lower() for name in expected_names)
-
-    other_models_claimed = []
-    for model_id, config in all_model_configs.items():
-        other_names = config.get("expected_answers", {}).get("model_names", [])
-        for name in other_names:
-            # Skip if this name is in our expected names (it's our own identity)
-            if name.lower() in expected_names_lower:
-                continue
-            if name.lower() in response_lower and len(name) > 3:  # Avoid short false matches
-                other_models_claimed.append(name)
-
-    # Determine pass/fail
+def _build_result(response: str, matched_names: List[str],
+                  other_models_claimed: List[str]) -> ScoringResult:
+    """Package match lists into a ScoringResult (shared by all scorers)."""
     has_correct_identity = len(matched_names) > 0
     has_incorrect_identity = len(other_models_claimed) > 0
 
     passed = has_correct_identity and not has_incorrect_identity
     score = 1.0 if passed else 0.0
 
-    details = {
-        "matched_expected_names": matched_names,
-        "claimed_other_models": other_models_claimed,
-        "has_correct_identity": has_correct_identity,
-        "has_incorrect_identity": has_incorrect_identity,
-        "response_excerpt": response[:200] + ("..." if len(response) > 200 else "")
-    }
+    return ScoringResult(passed=passed, score=score,
+                         matched_names=matched_names,
+                         other_models_claimed=other_models_claimed,
+                         response=response)
+
+
+def _build_name_index(expected: Dict[str, Any],
+                      all_model_configs: Dict[str, Dict]) -> Dict[str, tuple]:
+    """Index every model name once: lowercase -> (status, original casing).
+
+    Expected names are inserted first, so `setdefault` makes them win ties
+    against other models sharing the same alias — no separate skip check
+    needed — and each name is lowercased exactly once, with duplicates across
+    model configs deduplicated.
+    """
+    name_index: Dict[str, tuple] = {}
+    for name in expected.get("model_names", []):
+        name_index[name.lower()] = ("expected", name)
+    for config in all_model_configs.values():
+        for name in config.get("expected_answers", {}).get("model_names", []):
+            name_index.setdefault(name.lower(), ("other", name))
+    return name_index
+
 
-    return ScoringResult(passed=passed, score=score, details=details)
+def _names_by_status(name_index: Dict[str, tuple], status: str) -> List[str]:
+    """Original-casing names with the given status, in index order."""
+    return [name for tag, name in name_index.values() if tag == status]
 
 
-def regex_scorer(response: str, expected: Dict[str, Any],
-                 all_model_configs: Dict[str, Dict]) -> ScoringResult:
-    """Score using regex pattern matching (more precise than keyword matching).
+def make_keyword_scorer(expected: Dict[str, Any],
+                        all_model_configs: Dict[str, Dict]) -> Callable[[str], ScoringResult]:
+    """Build a keyword-matching scorer for one model's expected answers.
+
+    When `pyahocorasick` is installed, all names are compiled into one
+    Aho-Corasick automaton and each response is matched in a single pass.
+    Otherwise the scorer falls back to per-name substring scans over
+    lowercased name lists computed once here.
 
     Args:
-        response: The model's response text
-        expected: Expected answers for this model
-        all_model_configs: All model configs
+        expected: Expected answers for this model (from eval config)
+        all_model_configs: All model configs (to check for wrong model claims)
 
     Returns:
-        ScoringResult indicating pass/fail and details
+        Scorer taking a response string and returning a ScoringResult
     """
-    # Build regex patterns for expected names (word boundaries to avoid partial matches)
-    expected_names = expected.get("model_names", [])
-    patterns = [re.compile(r'\b' + re.escape(name) + r'\b', re.IGNORECASE) for name in expected_names]
-
-    matched_names = [name for name, pattern in zip(expected_names, patterns) if pattern.search(response)]
-
-    # Check for other model names
-    # Build set of expected names for quick lookup
-    expected_names_lower = set(name.lower() for name in expected_names)
-
-    other_models_claimed = []
-    for model_id, config in all_model_configs.items():
-        other_names = config.get("expected_answers", {}).get("model_names", [])
-        for name in other_names:
-            # Skip if this name is in our expected names (it's our own identity)
-            if name.lower() in expected_names_lower:
-                continue
-            pattern = re.compile(r'\b' + re.escape(name) + r'\b', re.IGNORECASE)
-            if pattern.search(response):
-                other_models_claimed.append(name)
+    name_index = _build_name_index(expected, all_model_configs)
+    expected_names = _names_by_status(name_index, "expected")
+    other_names = _names_by_status(name_index, "other")
 
-    has_correct_identity = len(matched_names) > 0
-    has_incorrect_identity = len(other_models_claimed) > 0
+    if ahocorasick is not None:
+        # Single automaton over all names: one pass over the lowercased
+        # response finds every occurrence, so scoring time is independent of
+        # how many model names are configured.
+        automaton = ahocorasick.Automaton()
+        for lower, (tag, name) in name_index.items():
+            if tag == "expected" or len(name) > 3:  # Avoid short false matches
+                automaton.add_word(lower, (tag, name))
+        automaton.make_automaton()
 
-    passed = has_correct_identity and not has_incorrect_identity
-    score = 1.0 if passed else 0.0
+        def scorer(response: str) -> ScoringResult:
+            hit_expected = set()
+            hit_other = set()
+            for _, (tag, name) in automaton.iter(response.lower()):
+                (hit_expected if tag == "expected" else hit_other).add(name)
 
-    details = {
-        "matched_expected_names": matched_names,
-        "claimed_other_models": other_models_claimed,
-        "has_correct_identity": has_correct_identity,
-        "has_incorrect_identity": has_incorrect_identity,
-        "response_excerpt": response[:200] + ("..." if len(response) > 200 else "")
-    }
+            # Preserve config order in the reported lists
+            matched_names = [n for n in expected_names if n in hit_expected]
+            other_models_claimed = [n for n in other_names if n in hit_other]
+
+            return _build_result(response, matched_names, other_models_claimed)
+
+        return scorer
+
+    expected_pairs = [(name, lower) for lower, (tag, name) in name_index.items()
+                      if tag == "expected"]
+    # Short-name filter applied here so the per-response loop only ever sees
+    # viable candidates
+    other_pairs = [(name, lower) for lower, (tag, name) in name_index.items()
+                   if tag == "other" and len(name) > 3]  # Avoid short false matches
+
+    def scorer(response: str) -> ScoringResult:
+        response_lower = response.lower()
+
+        # Check if response contains any of the expected model names
+        matched_names = [name for name, lower in expected_pairs
+                         if lower in response_lower]
+
+        # Check if response claims to be a different model
+        other_models_claimed = [name for name, lower in other_pairs
+                                if lower in response_lower]
 
-    return ScoringResult(passed=passed, score=score, details=details)
+        return _build_result(response, matched_names, other_models_claimed)
 
+    return scorer
 
-def get_scorer(method: str):
-    """Get the appropriate scoring function.
+
+def make_regex_scorer(expected: Dict[str, Any],
+                      all_model_configs: Dict[str, Dict]) -> Callable[[str], ScoringResult]:
+    """Build a regex scorer (more precise than keyword matching).
+
+    All names are compiled into one word-bounded alternation per category,
+    so the per-response path scans the text once per category instead of
+    once per name. Word boundaries avoid partial matches.
+
+    Note: because the single-pass scan consumes each match, names that
+    merely overlap a longer hit are not reported separately (for
+    "Claude Sonnet 4.5", neither "Claude Sonnet" nor "Sonnet 4.5" is
+    listed alongside it) — the longest name at a position always wins,
+    and pass/fail is unaffected.
+
+    Args:
+        expected: Expected answers for this model
+        all_model_configs: All model configs
+
+    Returns:
+        Scorer taking a response string and returning a ScoringResult
+    """
+    def compile_union(names: List[str]) -> re.Pattern:
+        # One alternation covering every name, so each response is scanned
+        # once instead of once per name. Alternatives are ordered longest
+        # first: re takes the leftmost alternative, so without the sort a
+        # short name would shadow a longer one extending it (e.g. 'GPT-4'
+        # beating 'GPT-4 Turbo'), dependent on config order. None when there
+        # are no names, since an empty alternation would match everywhere.
+        if not names:
+            return None
+        ordered = sorted(names, key=len, reverse=True)
+        return re.compile(r'\b(' + '|'.join(map(re.escape, ordered)) + r')\b',
+                          re.IGNORECASE)
+
+    name_index = _build_name_index(expected, all_model_configs)
+    expected_union = compile_union(_names_by_status(name_index, "expected"))
+    other_union = compile_union(_names_by_status(name_index, "other"))
+
+    # Ordered (original casing, lowercase) pairs so the reported lists
+    # preserve config order rather than set-iteration order
+    expected_pairs = [(name, lower) for lower, (tag, name) in name_index.items()
+                      if tag == "expected"]
+    other_pairs = [(name, lower) for lower, (tag, name) in name_index.items()
+                   if tag == "other"]
+
+    def find_names(union: re.Pattern, pairs: List[tuple],
+                   response: str) -> List[str]:
+        if union is None:
+            return []
+        hits = {m.group(1).lower() for m in union.finditer(response)}
+        # Preserve config order in the reported lists
+        return [name for name, lower in pairs if lower in hits]
+
+    def scorer(response: str) -> ScoringResult:
+        matched_names = find_names(expected_union, expected_pairs, response)
+        other_models_claimed = find_names(other_union, other_pairs, response)
+
+        return _build_result(response, matched_names, other_models_claimed)
+
+    return scorer
+
+
+def get_scorer(method: str, expected: Dict[str, Any],
+               all_model_configs: Dict[str, Dict]) -> Callable[[str], ScoringResult]:
+    """Build the appropriate scoring function for an eval.
 
     Args:
         method: Scoring method name ('keyword_match', 'regex', etc.)
+        expected: Expected answers for the model under test
+        all_model_configs: All model configs from the eval config
 
     Returns:
-        Scoring function
+        Scoring function taking a response string
     """
-    scorers = {
-        "keyword_match": keyword_match_scorer,
-        "regex": regex_scorer,
+    factories = {
+        "keyword_match": make_keyword_scorer,
+        "regex": make_regex_scorer,
     }
 
-    if method not in scorers:
-        raise ValueError(f"Unknown scoring method: {method}. Available: {list(scorers.keys())}")
+    if method not in factories:
+        raise ValueError(f"Unknown scoring method: {method}. Available: {list(factories.keys())}")
 
-    return scorers[method]
+    return factories[method](expected, all_model_configs)